@@ -9,11 +9,34 @@ from pathlib import Path
 from rich.console import Console
 
 from .config import TFVizConfig
+from .graph import load_graph, save_graph
 from .orchestrator import TFVizOrchestrator
 
 console = Console()
 
 
+def positive_int(value: str) -> int:
+    """Parse a command line value as an integer of at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def positive_float(value: str) -> float:
+    """Parse a command line value as a number greater than 0."""
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid float value: '{value}'")
+    if not number > 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+    return number
+
+
 def create_config_from_args(args: argparse.Namespace) -> TFVizConfig:
     """Create configuration from parsed arguments."""
     # Determine output mode and path
@@ -28,6 +51,20 @@ def create_config_from_args(args: argparse.Namespace) -> TFVizConfig:
         )
         terminal_output = False
 
+    layout_cache_dir = args.layout_cache
+    if layout_cache_dir is not None and not layout_cache_dir.is_absolute():
+        layout_cache_dir = Path.cwd() / layout_cache_dir
+
+    graph_file = None
+    if args.graph is not None:
+        graph_file = args.graph if args.graph.is_absolute() else Path.cwd() / args.graph
+
+    estate_dirs = None
+    if args.estate:
+        estate_dirs = [
+            path if path.is_absolute() else Path.cwd() / path for path in args.estate
+        ]
+
     return TFVizConfig(
         tf_path=args.tf_path,
         tf_dir=args.tf_dir,
@@ -37,6 +74,14 @@ def create_config_from_args(args: argparse.Namespace) -> TFVizConfig:
         keep_dot=args.keep_dot,
         verbose=args.verbose,
         terminal_output=terminal_output,
+        cluster_modules=args.cluster_modules,
+        layout_cache_dir=layout_cache_dir,
+        jobs=args.jobs,
+        timeout=args.timeout,
+        memory_limit_mb=args.memory_limit,
+        cpu_limit_seconds=args.cpu_limit,
+        estate_dirs=estate_dirs,
+        graph_file=graph_file,
     )
 
 
@@ -54,6 +99,11 @@ Examples:
   terraform-viz --tf-path C:\\tools\\tf.exe        # Specify TF executable path
   terraform-viz --node-padding 1.5 -o out.png    # More spacing between nodes (PNG)
   terraform-viz --tf-dir ../dev                  # Use TF files from different directory
+  terraform-viz --cluster-modules -o out.png     # Lay out each module separately (PNG)
+  terraform-viz --timeout 300 -o out.png         # Kill Graphviz if it hangs
+  terraform-viz --estate stacks/* -o estate.png  # Combine many root modules
+  terraform-viz --graph snapshot.tfvg            # Visualize a saved graph file
+  terraform-viz convert graph.dot -o graph.tfvg  # Convert to binary graph store
         """,
     )
 
@@ -97,15 +147,131 @@ Examples:
     )
 
     parser.add_argument(
+        "--cluster-modules",
+        action="store_true",
+        help="Lay out each module as a separate cached cluster (PNG only)",
+    )
+
+    parser.add_argument(
+        "--layout-cache",
+        type=Path,
+        default=None,
+        help="Directory for cached module layouts (default: ~/.cache/terraform-viz/layouts)",
+    )
+
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=positive_int,
+        default=None,
+        help="Maximum number of concurrent Terraform/Graphviz processes (default: CPU count)",
+    )
+
+    parser.add_argument(
+        "--timeout",
+        type=positive_float,
+        default=None,
+        help="Kill Terraform/Graphviz processes running longer than SECONDS",
+    )
+
+    parser.add_argument(
+        "--memory-limit",
+        type=positive_int,
+        default=None,
+        help="Memory limit in MB for each Terraform/Graphviz process (Linux only)",
+    )
+
+    parser.add_argument(
+        "--cpu-limit",
+        type=positive_int,
+        default=None,
+        help="CPU time limit in seconds for each Terraform/Graphviz process (Linux only)",
+    )
+
+    # Each of these chooses where the graph comes from
+    source = parser.add_mutually_exclusive_group()
+
+    source.add_argument(
         "--plan-file",
         type=Path,
         default=None,
         help="Path to Terraform plan file to visualize (optional)",
     )
 
+    source.add_argument(
+        "--estate",
+        type=Path,
+        nargs="+",
+        default=None,
+        metavar="DIR",
+        help="Root module directories to merge into one estate graph (replaces --tf-dir)",
+    )
+
+    source.add_argument(
+        "--graph",
+        type=Path,
+        default=None,
+        help="Visualize an existing DOT, JSON or .tfvg graph file instead of running Terraform",
+    )
+
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
+    add_convert_parser(subparsers)
+
     return parser.parse_args()
 
 
+def add_convert_parser(subparsers: argparse._SubParsersAction) -> None:
+    """Add the convert command and its arguments."""
+    parser = subparsers.add_parser(
+        "convert",
+        help="Convert graph files between DOT, JSON and .tfvg",
+        description="Convert graph files between DOT, JSON and the binary .tfvg store",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  terraform-viz convert tf_graph.dot -o snapshot.tfvg             # DOT to binary store
+  terraform-viz convert tf_graph.dot -o snapshot.tfvg --compress  # Compressed store
+  terraform-viz convert snapshot.tfvg -o graph.json               # Binary store to JSON
+        """,
+    )
+
+    parser.add_argument(
+        "input", type=Path, help="Input graph file (DOT, JSON or .tfvg)"
+    )
+
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        required=True,
+        help="Output file; format is chosen by suffix (.tfvg, .json, .dot or .gv)",
+    )
+
+    parser.add_argument(
+        "--compress",
+        action="store_true",
+        help="Compress the binary store (smaller, but not memory-mappable)",
+    )
+
+
+def convert(args: argparse.Namespace) -> None:
+    """Convert a graph file to another format."""
+    try:
+        graph = load_graph(args.input)
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        save_graph(graph, args.output, args.compress)
+    except (OSError, ValueError) as e:
+        console.print(f"[bold red][ ERROR ][/] {e}")
+        sys.exit(1)
+
+    size_mb = args.output.stat().st_size / (1024 * 1024)
+    console.print(
+        f"[bold green][ OK    ][/] Converted [white]{len(graph.nodes)}[/] nodes, "
+        f"[white]{len(graph.edges)}[/] edges to: [white]{args.output}[/]"
+    )
+    console.print(f"[cyan][ INFO  ][/] File size: [white]{size_mb:.2f} MB[/]")
+
+
 def show_welcome():
     """Display welcome screen with MS-DOS style."""
     from rich.panel import Panel
@@ -145,6 +311,11 @@ def show_welcome():
     table.add_row("--plan-file FILE", "Visualize specific plan file")
     table.add_row("--node-padding N", "Adjust spacing between nodes")
     table.add_row("--keep-dot", "Keep intermediate DOT file")
+    table.add_row("--cluster-modules", "Lay out each module separately")
+    table.add_row("--timeout SECONDS", "Kill hung Terraform/Graphviz processes")
+    table.add_row("--estate DIR...", "Merge many root modules into one graph")
+    table.add_row("--graph FILE", "Visualize a saved DOT/JSON/.tfvg graph")
+    table.add_row("convert IN -o OUT", "Convert graph files (e.g. DOT to .tfvg)")
 
     console.print(table)
     console.print()
@@ -163,6 +334,10 @@ def main():
 
     args = parse_arguments()
 
+    if args.command == "convert":
+        convert(args)
+        return
+
     try:
         config = create_config_from_args(args)
         orchestrator = TFVizOrchestrator(config)
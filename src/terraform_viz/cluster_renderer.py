@@ -0,0 +1,318 @@
+"""PNG rendering with per-module clustered layout."""
+
+import asyncio
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from rich.console import Console
+
+from .graph import Graph, format_attrs, load_graph, module_path, quote
+from .process_runner import ProcessRunner
+
+console = Console()
+
+# Bump when the cached layout format or layout parameters change
+LAYOUT_VERSION = 1
+
+# Padding around each module frame and extra room for its label (inches)
+FRAME_PADDING = 0.3
+FRAME_LABEL_HEIGHT = 0.4
+
+POINTS_PER_INCH = 72
+
+
+def default_cache_dir() -> Path:
+    """Get the default directory for cached cluster layouts."""
+    return Path.home() / ".cache" / "terraform-viz" / "layouts"
+
+
+def parse_plain(plain: str) -> dict:
+    """Parse Graphviz `-Tplain` output into graph size and node centers (inches)."""
+    layout = {"width": 0.0, "height": 0.0, "nodes": {}}
+    for line in plain.splitlines():
+        fields = line.split(maxsplit=6)
+        if not fields:
+            continue
+        if fields[0] == "graph":
+            layout["width"] = float(fields[2])
+            layout["height"] = float(fields[3])
+        elif fields[0] == "node":
+            layout["nodes"][fields[1]] = [float(fields[2]), float(fields[3])]
+    return layout
+
+
+class LayoutCache:
+    """Stores cluster layouts on disk, keyed by the hash of their DOT source."""
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def key(source: str) -> str:
+        """Compute the cache key for a cluster's DOT source."""
+        digest = hashlib.sha256(f"v{LAYOUT_VERSION}\n{source}".encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> dict | None:
+        """Return a cached layout, or None on a miss."""
+        try:
+            return json.loads((self.cache_dir / f"{key}.json").read_text())
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, layout: dict) -> None:
+        """Store a layout, replacing the file atomically."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.cache_dir / f"{key}.json"
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(layout))
+        os.replace(tmp_path, path)
+
+
+class ClusteredImageRenderer:
+    """Renders DOT files to PNG by laying out each module independently.
+
+    The graph is split by module path. Each module is laid out by its own
+    concurrent `dot` process and cached by content hash, so unchanged modules
+    are never laid out again. The modules are then placed by a small top-level
+    layout of one box per module, and the final image is drawn with fixed node
+    positions.
+    """
+
+    def __init__(
+        self,
+        dot_path: str,
+        verbose: bool = False,
+        cache_dir: Path | None = None,
+        runner: ProcessRunner | None = None,
+    ):
+        self.dot_path = dot_path
+        self.verbose = verbose
+        self.cache = LayoutCache(cache_dir or default_cache_dir())
+        self.runner = runner or ProcessRunner(verbose=verbose)
+
+    def render(
+        self, dot_file: Path, output_file: Path, node_padding: float = 1.0
+    ) -> None:
+        """Render DOT file to PNG using per-module cluster layouts."""
+        asyncio.run(self._render(dot_file, output_file, node_padding))
+
+    async def _render(
+        self, dot_file: Path, output_file: Path, node_padding: float
+    ) -> None:
+        """Lay out all clusters concurrently, then draw the composed graph."""
+        with console.status(
+            "[magenta]Rendering clustered PNG visualization...[/]", spinner="dots"
+        ):
+            if self.verbose:
+                console.print("[cyan]>>>[/] Rendering clustered PNG visualization...")
+
+            graph = load_graph(dot_file)
+            clusters = self._split_clusters(graph)
+            graph_attrs = self._graph_attrs(node_padding)
+
+            internal_edges = self._internal_edges(graph, clusters)
+
+            sources = {
+                path: self._cluster_source(
+                    graph, members, internal_edges[path], graph_attrs
+                )
+                for path, members in clusters.items()
+            }
+            layouts = await self._layout_clusters(sources)
+            centers = await self._layout_top_level(
+                graph, clusters, layouts, graph_attrs
+            )
+            final_source = self._compose(graph, clusters, layouts, centers)
+
+            result = await self.runner.run(
+                [
+                    self.dot_path,
+                    "-Kneato",
+                    "-n2",
+                    "-Tpng",
+                    "-Gmargin=0",
+                    "-Gdpi=150",
+                    "-o",
+                    str(output_file),
+                ],
+                input=final_source,
+            )
+            if result.returncode != 0:
+                raise RuntimeError(f"Failed to render PNG: {result.stderr.strip()}")
+
+    @staticmethod
+    def _graph_attrs(node_padding: float) -> str:
+        """Build the graph attributes shared by every layout pass."""
+        return f"nodesep = {node_padding * 0.8}; ranksep = {node_padding * 1.2}"
+
+    @staticmethod
+    def _split_clusters(graph: Graph) -> dict[str, list[str]]:
+        """Group node names by module path, sorted for stable hashing."""
+        clusters: dict[str, list[str]] = {}
+        for node in graph.nodes:
+            clusters.setdefault(module_path(node), []).append(node)
+        return {path: sorted(clusters[path]) for path in sorted(clusters)}
+
+    @staticmethod
+    def _internal_edges(
+        graph: Graph, clusters: dict[str, list[str]]
+    ) -> dict[str, list[tuple[str, str]]]:
+        """Bucket the edges that stay within a single cluster, in one pass."""
+        cluster_of = {
+            node: path for path, members in clusters.items() for node in members
+        }
+        internal: dict[str, list[tuple[str, str]]] = {path: [] for path in clusters}
+        for source, target in graph.edges:
+            if cluster_of[source] == cluster_of[target]:
+                internal[cluster_of[source]].append((source, target))
+        return internal
+
+    @staticmethod
+    def _cluster_source(
+        graph: Graph,
+        members: list[str],
+        edges: list[tuple[str, str]],
+        graph_attrs: str,
+    ) -> str:
+        """Build standalone DOT source for one cluster.
+
+        Nodes get positional IDs (n0, n1, ...) so the source, and therefore the
+        cache key, only depends on what affects the layout.
+        """
+        index = {node: i for i, node in enumerate(members)}
+        lines = ["digraph {", f"\t{graph_attrs}", *graph.header_lines()]
+        for node, i in index.items():
+            attrs = {"label": node.removeprefix("[root] ")}
+            attrs.update(graph.nodes[node])
+            lines.append(f"\tn{i}{format_attrs(attrs)}")
+        for source, target in edges:
+            lines.append(f"\tn{index[source]} -> n{index[target]}")
+        lines.append("}")
+        return "\n".join(lines) + "\n"
+
+    async def _layout_source(self, source: str) -> dict:
+        """Lay out DOT source with Graphviz and return node positions."""
+        result = await self.runner.run([self.dot_path, "-Tplain"], input=source)
+        if result.returncode != 0:
+            raise RuntimeError(f"Failed to lay out cluster: {result.stderr.strip()}")
+        return parse_plain(result.stdout)
+
+    async def _layout_clusters(self, sources: dict[str, str]) -> dict[str, dict]:
+        """Lay out every cluster, reusing cached layouts where possible."""
+        layouts = {}
+        misses = {}
+        for path, source in sources.items():
+            key = self.cache.key(source)
+            cached = self.cache.get(key)
+            if cached is not None:
+                layouts[path] = cached
+            else:
+                misses[path] = (key, source)
+
+        if self.verbose:
+            console.print(
+                f"[cyan]>>>[/] Module clusters: [white]{len(sources)}[/] "
+                f"([white]{len(sources) - len(misses)}[/] cached, "
+                f"[white]{len(misses)}[/] to lay out)"
+            )
+
+        results = await asyncio.gather(
+            *(self._layout_source(source) for _, source in misses.values())
+        )
+        for (path, (key, _)), layout in zip(misses.items(), results):
+            layouts[path] = layout
+            self.cache.put(key, layout)
+
+        return layouts
+
+    async def _layout_top_level(
+        self,
+        graph: Graph,
+        clusters: dict[str, list[str]],
+        layouts: dict[str, dict],
+        graph_attrs: str,
+    ) -> dict[str, list[float]]:
+        """Place clusters relative to each other; return cluster centers (inches)."""
+        paths = list(clusters)
+        cluster_of = {
+            node: i for i, path in enumerate(paths) for node in clusters[path]
+        }
+
+        lines = ["digraph {", f"\t{graph_attrs}", *graph.header_lines()]
+        for i, path in enumerate(paths):
+            width, height = self._frame_size(layouts[path])
+            lines.append(
+                f'\tc{i} [shape = "box", fixedsize = "true", label = "", '
+                f'width = "{width}", height = "{height}"]'
+            )
+
+        cluster_edges = set()
+        for source, target in graph.edges:
+            pair = (cluster_of[source], cluster_of[target])
+            if pair[0] != pair[1]:
+                cluster_edges.add(pair)
+        for source, target in sorted(cluster_edges):
+            lines.append(f"\tc{source} -> c{target}")
+        lines.append("}")
+
+        top_level = await self._layout_source("\n".join(lines) + "\n")
+        return {path: top_level["nodes"][f"c{i}"] for i, path in enumerate(paths)}
+
+    @staticmethod
+    def _frame_size(layout: dict) -> tuple[float, float]:
+        """Get the size of a cluster's frame including padding and label (inches)."""
+        return (
+            layout["width"] + 2 * FRAME_PADDING,
+            layout["height"] + 2 * FRAME_PADDING + FRAME_LABEL_HEIGHT,
+        )
+
+    def _compose(
+        self,
+        graph: Graph,
+        clusters: dict[str, list[str]],
+        layouts: dict[str, dict],
+        centers: dict[str, list[float]],
+    ) -> str:
+        """Build the final DOT source with every node pinned in place."""
+        lines = ["digraph {", *graph.header_lines(), '\toutputorder = "nodesfirst"']
+
+        for path, members in clusters.items():
+            layout = layouts[path]
+            width, height = self._frame_size(layout)
+            center_x, center_y = centers[path]
+            origin_x = center_x - width / 2 + FRAME_PADDING
+            origin_y = center_y - height / 2 + FRAME_PADDING
+
+            # Frame first so member nodes are drawn on top of it
+            if path:
+                frame = {
+                    "label": path,
+                    "shape": "box",
+                    "style": "dashed",
+                    "labelloc": "t",
+                    "fixedsize": "true",
+                    "width": str(width),
+                    "height": str(height),
+                    "pos": self._pos(center_x, center_y),
+                }
+                lines.append(f"\t{quote(f'cluster {path}')}{format_attrs(frame)}")
+
+            for i, node in enumerate(members):
+                x, y = layout["nodes"][f"n{i}"]
+                attrs = {"label": node.removeprefix("[root] ")}
+                attrs.update(graph.nodes[node])
+                attrs["pos"] = self._pos(origin_x + x, origin_y + y)
+                lines.append(f"\t{quote(node)}{format_attrs(attrs)}")
+
+        for source, target in graph.edges:
+            lines.append(f"\t{quote(source)} -> {quote(target)}")
+        lines.append("}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _pos(x: float, y: float) -> str:
+        """Format a pinned position in points from inches."""
+        return f"{x * POINTS_PER_INCH:.2f},{y * POINTS_PER_INCH:.2f}!"
@@ -16,6 +16,14 @@ class TFVizConfig:
     keep_dot: bool
     verbose: bool
     terminal_output: bool = False
+    cluster_modules: bool = False
+    layout_cache_dir: Path | None = None
+    jobs: int | None = None
+    timeout: float | None = None
+    memory_limit_mb: int | None = None
+    cpu_limit_seconds: int | None = None
+    estate_dirs: list[Path] | None = None
+    graph_file: Path | None = None
 
     @property
     def dot_file_path(self) -> Path:
@@ -0,0 +1,333 @@
+"""Aggregated graphs across many Terraform root modules."""
+
+import asyncio
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+
+from rich.console import Console
+
+from .graph import Graph
+from .graph_generator import GraphGenerator
+from .process_runner import ProcessRunner
+
+console = Console()
+
+# Matches the header of: data "terraform_remote_state" "network" {
+_REMOTE_STATE_PATTERN = re.compile(
+    r'data\s+"terraform_remote_state"\s+"([\w-]+)"\s*\{'
+)
+
+# Matches: data.terraform_remote_state.network.outputs.vpc_id
+_OUTPUT_REF_PATTERN = re.compile(
+    r"data\.terraform_remote_state\.([\w-]+)\.outputs\.([\w-]+)"
+)
+
+# Backend settings that identify the state a remote_state block reads
+_STATE_SETTING_PATTERN = re.compile(r'\b(path|key|prefix|name)\s*=\s*"([^"]+)"')
+
+# Terraform graph node suffixes, e.g. "aws_vpc.main (expand)"
+_NODE_SUFFIX_PATTERN = re.compile(r" \((?:expand|close)\)$")
+
+
+def node_address(node: str) -> str:
+    """Get the Terraform address of a node, without graph decorations."""
+    return _NODE_SUFFIX_PATTERN.sub("", node.removeprefix("[root] "))
+
+
+@dataclass
+class RemoteState:
+    """A `terraform_remote_state` data source declared in a root module."""
+
+    name: str
+    settings: dict[str, str] = field(default_factory=dict)
+    outputs: set[str] = field(default_factory=set)
+
+
+@dataclass
+class EstateRoot:
+    """A Terraform root module taking part in an estate graph."""
+
+    name: str
+    path: Path
+    remote_states: dict[str, RemoteState] = field(default_factory=dict)
+
+
+def find_remote_states(root_dir: Path) -> dict[str, RemoteState]:
+    """Scan a root module's .tf files for remote state sources and their outputs."""
+    remote_states: dict[str, RemoteState] = {}
+    references: list[tuple[str, str]] = []
+
+    for tf_file in sorted(root_dir.glob("*.tf")):
+        content = tf_file.read_text(errors="replace")
+
+        for match in _REMOTE_STATE_PATTERN.finditer(content):
+            body = _block_body(content, match.end())
+            settings = dict(_STATE_SETTING_PATTERN.findall(body))
+            remote_states[match.group(1)] = RemoteState(match.group(1), settings)
+
+        references.extend(_OUTPUT_REF_PATTERN.findall(content))
+
+    for name, output in references:
+        if name in remote_states:
+            remote_states[name].outputs.add(output)
+
+    return remote_states
+
+
+def _block_body(content: str, start: int) -> str:
+    """Return the text of an HCL block whose opening brace ends at `start`."""
+    depth = 1
+    for i in range(start, len(content)):
+        if content[i] == "{":
+            depth += 1
+        elif content[i] == "}":
+            depth -= 1
+            if depth == 0:
+                return content[start:i]
+    return content[start:]
+
+
+class EstateBuilder:
+    """Builds one graph from many Terraform root modules.
+
+    Each root's graph is generated concurrently and its nodes are namespaced
+    as `[<root>] <address>`. Cross-root edges are inferred from
+    `terraform_remote_state` data sources: the consuming data source is linked
+    to the producing root's outputs. Output nodes referenced from the .tf files
+    are created when the producer's graph lacks them, as plain `terraform graph`
+    only emits resources from Terraform 1.7 on. Roots are matched through dict indexes on
+    name and state location, so merging stays linear in nodes and edges.
+    """
+
+    def __init__(
+        self,
+        tf_path: str,
+        verbose: bool = False,
+        runner: ProcessRunner | None = None,
+    ):
+        self.tf_path = tf_path
+        self.verbose = verbose
+        self.runner = runner or ProcessRunner(verbose=verbose)
+        self.graph_gen = GraphGenerator(tf_path, verbose, self.runner)
+
+    def build(self, root_dirs: list[Path]) -> Graph:
+        """Generate, merge and link the graphs of all root modules."""
+        roots = self._discover_roots(root_dirs)
+
+        with console.status(
+            f"[yellow]Generating TF graphs for {len(roots)} roots...[/]",
+            spinner="dots",
+        ):
+            if self.verbose:
+                console.print(
+                    f"[cyan]>>>[/] Generating TF graphs for [white]{len(roots)}[/] roots..."
+                )
+            graphs = asyncio.run(self._generate_all(roots))
+
+        return self.merge(roots, graphs)
+
+    @staticmethod
+    def _discover_roots(root_dirs: list[Path]) -> list[EstateRoot]:
+        """Name each root by its path relative to the roots' common parent."""
+        paths = [root_dir.resolve() for root_dir in root_dirs]
+        for path in paths:
+            if not path.is_dir():
+                raise FileNotFoundError(f"Directory '{path}' does not exist")
+
+        if len(paths) == 1:
+            return [EstateRoot(paths[0].name, paths[0], find_remote_states(paths[0]))]
+
+        common = Path(os.path.commonpath(paths))
+        return [
+            EstateRoot(
+                path.relative_to(common).as_posix(), path, find_remote_states(path)
+            )
+            for path in paths
+        ]
+
+    async def _generate_all(self, roots: list[EstateRoot]) -> list[Graph]:
+        """Run `terraform graph` in every root concurrently."""
+        return await asyncio.gather(
+            *(
+                self.graph_gen.generate_graph(cwd=root.path, name=root.name)
+                for root in roots
+            )
+        )
+
+    def merge(self, roots: list[EstateRoot], graphs: list[Graph]) -> Graph:
+        """Merge per-root graphs into one graph with namespaced nodes."""
+        estate = Graph()
+        # (root name, address) -> namespaced node ID
+        addresses: dict[tuple[str, str], str] = {}
+        # root name -> namespaced IDs of its output nodes
+        outputs: dict[str, list[str]] = {}
+
+        for root, graph in zip(roots, graphs):
+            # Keep the layout direction and default styles of the first root
+            for merged, attrs in (
+                (estate.attrs, graph.attrs),
+                (estate.node_defaults, graph.node_defaults),
+                (estate.edge_defaults, graph.edge_defaults),
+            ):
+                for key, value in attrs.items():
+                    merged.setdefault(key, value)
+
+            namespaced = {}
+            for node, attrs in graph.nodes.items():
+                address = node_address(node)
+                node_id = f"[{root.name}] {node.removeprefix('[root] ')}"
+                namespaced[node] = node_id
+
+                label = attrs.get("label", node.removeprefix("[root] "))
+                estate.add_node(node_id, {**attrs, "label": f"{root.name}: {label}"})
+
+                addresses.setdefault((root.name, address), node_id)
+                if address.startswith("output."):
+                    outputs.setdefault(root.name, []).append(node_id)
+
+            for source, target in graph.edges:
+                estate.add_edge(namespaced[source], namespaced[target])
+
+        cross_edges = self._link_remote_states(estate, roots, addresses, outputs)
+        for source, target in sorted(cross_edges):
+            estate.add_edge(source, target)
+
+        if self.verbose:
+            console.print(
+                f"[cyan]>>>[/] Estate graph: [white]{len(estate.nodes)}[/] nodes, "
+                f"[white]{len(estate.edges)}[/] edges "
+                f"([white]{len(cross_edges)}[/] cross-root)"
+            )
+        return estate
+
+    def _link_remote_states(
+        self,
+        estate: Graph,
+        roots: list[EstateRoot],
+        addresses: dict[tuple[str, str], str],
+        outputs: dict[str, list[str]],
+    ) -> set[tuple[str, str]]:
+        """Infer edges from remote state consumers to producer outputs."""
+        index = self._root_index(roots)
+        edges = set()
+
+        for root in roots:
+            for remote_state in root.remote_states.values():
+                source = f"{root.name}/{remote_state.name}"
+                producer = self._resolve_producer(root, remote_state, index)
+                if producer is None:
+                    if self.verbose:
+                        console.print(
+                            f"[dim]>>>[/] No root found for remote state {source}"
+                        )
+                    continue
+                if producer == root.name:
+                    if self.verbose:
+                        console.print(
+                            f"[dim]>>>[/] Remote state {source} refers to its own root"
+                        )
+                    continue
+
+                consumer = addresses.get(
+                    (root.name, f"data.terraform_remote_state.{remote_state.name}")
+                )
+                if consumer is None:
+                    if self.verbose:
+                        console.print(
+                            f"[dim]>>>[/] Remote state {source} is not in the graph"
+                        )
+                    continue
+
+                targets = [
+                    self._output_node(estate, addresses, producer, output)
+                    for output in sorted(remote_state.outputs)
+                ]
+                targets = targets or outputs.get(producer, [])
+                if not targets:
+                    console.print(
+                        f"[yellow][ WARN  ][/] Remote state {source} reads "
+                        f"[white]{producer}[/] but no outputs of it are referenced "
+                        "or in its graph; no cross-root edge added"
+                    )
+                for target in targets:
+                    edges.add((consumer, target))
+
+        return edges
+
+    @staticmethod
+    def _output_node(
+        estate: Graph,
+        addresses: dict[tuple[str, str], str],
+        producer: str,
+        output: str,
+    ) -> str:
+        """Get the node of a producer's output, creating it if the graph lacks it."""
+        address = f"output.{output}"
+        node_id = addresses.get((producer, address))
+        if node_id is None:
+            node_id = f"[{producer}] {address}"
+            label = f"{producer}: {address}"
+            estate.add_node(node_id, {"label": label, "shape": "note"})
+            addresses[(producer, address)] = node_id
+        return node_id
+
+    def _root_index(self, roots: list[EstateRoot]) -> dict[str, str]:
+        """Index roots by every key a remote state may use to refer to them.
+
+        Keys shared by several roots (e.g. two roots both named `prod`) are left
+        out, so an ambiguous reference finds no producer instead of a wrong one.
+        """
+        index: dict[str, str] = {}
+        ambiguous: dict[str, set[str]] = {}
+        for root in roots:
+            for key in {
+                f"dir:{root.path}",
+                f"name:{root.name}",
+                f"name:{root.path.name}",
+            }:
+                if key in ambiguous:
+                    ambiguous[key].add(root.name)
+                elif key in index and index[key] != root.name:
+                    ambiguous[key] = {index.pop(key), root.name}
+                else:
+                    index[key] = root.name
+
+        for key, names in sorted(ambiguous.items()):
+            console.print(
+                f"[yellow][ WARN  ][/] Ambiguous root name [white]{key.split(':', 1)[1]}[/] "
+                f"({', '.join(sorted(names))}); remote states using it are not linked"
+            )
+        return index
+
+    @staticmethod
+    def _resolve_producer(
+        root: EstateRoot, remote_state: RemoteState, index: dict[str, str]
+    ) -> str | None:
+        """Find the root that a remote state data source reads from."""
+        settings = remote_state.settings
+        candidates = []
+
+        # Local backend: config = { path = "../network/terraform.tfstate" }
+        if "path" in settings:
+            state_dir = (root.path / settings["path"]).resolve().parent
+            candidates.append(f"dir:{state_dir}")
+
+        # Remote backends: key = "network/terraform.tfstate", prefix, workspace name
+        for setting in ("key", "prefix", "name"):
+            if setting in settings:
+                location = PurePosixPath(settings[setting])
+                if location.suffix == ".tfstate":
+                    location = location.parent
+                if location.parts:
+                    candidates.append(f"name:{location.as_posix()}")
+                    candidates.append(f"name:{location.name}")
+
+        # Shared names: data "terraform_remote_state" "network" -> root "network"
+        candidates.append(f"name:{remote_state.name}")
+
+        for candidate in candidates:
+            if candidate in index:
+                return index[candidate]
+        return None
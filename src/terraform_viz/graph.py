@@ -0,0 +1,241 @@
+"""In-memory model of Terraform dependency graphs."""
+
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# A double-quoted DOT ID, allowing backslash escapes inside the quotes
+_QUOTED_ID = r'"((?:[^"\\]|\\.)*)"'
+
+# Matches: "source" -> "target"
+_EDGE_PATTERN = re.compile(rf"^\s*{_QUOTED_ID}\s*->\s*{_QUOTED_ID}")
+
+# Matches: "node_name" [label = "...", shape = "box"]
+_NODE_PATTERN = re.compile(rf"^\s*{_QUOTED_ID}\s*\[(.*)\]\s*;?\s*$")
+
+# Matches a graph attribute statement: rankdir = "RL"
+_GRAPH_ATTR_PATTERN = re.compile(rf'^\s*(\w+)\s*=\s*(?:{_QUOTED_ID}|([^,;\s\]]+))\s*;?\s*$')
+
+# Matches default attributes: node [shape = rect, fontname = "sans-serif"]
+_DEFAULTS_PATTERN = re.compile(r"^\s*(graph|node|edge)\s*\[(.*)\]\s*;?\s*$")
+
+# Matches a single attribute inside a node's attribute list
+_ATTR_PATTERN = re.compile(rf'(\w+)\s*=\s*(?:{_QUOTED_ID}|([^,;\s\]]+))')
+
+# Matches the namespace prefix of a node, e.g. "[root] " or "[network] "
+_NAMESPACE_PATTERN = re.compile(r"^\[([^\]]*)\] ")
+
+# Matches the leading module path of a node, e.g. module.net.module.subnets
+_MODULE_PATTERN = re.compile(r"^(?:module\.[^.\[\s]+(?:\[[^\]]*\])?\.?)+")
+
+
+def unescape(value: str) -> str:
+    """Undo DOT backslash escaping of double quotes and backslashes."""
+    return re.sub(r'\\(["\\])', r"\1", value)
+
+
+def quote(value: str) -> str:
+    """Quote a string as a DOT ID."""
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def module_path(node: str) -> str:
+    """Return the module path of a node, or an empty string for the root module.
+
+    Nodes namespaced by an estate root (e.g. "[network] module.vpc.aws_vpc.this")
+    are prefixed with the root name ("network/module.vpc").
+    """
+    namespace = ""
+    name = node
+    match = _NAMESPACE_PATTERN.match(node)
+    if match:
+        name = node[match.end() :]
+        if match.group(1) != "root":
+            namespace = match.group(1)
+
+    match = _MODULE_PATTERN.match(name)
+    path = match.group(0).rstrip(".") if match else ""
+    return "/".join(part for part in (namespace, path) if part)
+
+
+@dataclass
+class Graph:
+    """Nodes and edges of a Terraform dependency graph.
+
+    `attrs` holds graph attributes such as `rankdir`, and `node_defaults` and
+    `edge_defaults` the attributes of `node [...]` and `edge [...]` statements.
+    """
+
+    nodes: dict[str, dict[str, str]] = field(default_factory=dict)
+    edges: list[tuple[str, str]] = field(default_factory=list)
+    attrs: dict[str, str] = field(default_factory=dict)
+    node_defaults: dict[str, str] = field(default_factory=dict)
+    edge_defaults: dict[str, str] = field(default_factory=dict)
+
+    def add_node(self, node: str, attrs: dict[str, str] | None = None) -> None:
+        """Add a node, merging attributes if it already exists."""
+        self.nodes.setdefault(node, {}).update(attrs or {})
+
+    def add_edge(self, source: str, target: str) -> None:
+        """Add an edge, implicitly declaring both endpoints."""
+        self.nodes.setdefault(source, {})
+        self.nodes.setdefault(target, {})
+        self.edges.append((source, target))
+
+    def header_lines(self) -> list[str]:
+        """Get the DOT statements for graph attributes and defaults."""
+        lines = [f"\t{key} = {quote(value)}" for key, value in self.attrs.items()]
+        if self.node_defaults:
+            lines.append(f"\tnode{format_attrs(self.node_defaults)}")
+        if self.edge_defaults:
+            lines.append(f"\tedge{format_attrs(self.edge_defaults)}")
+        return lines
+
+    def to_dot(self) -> str:
+        """Serialize the graph back to DOT text."""
+        lines = ["digraph {", *self.header_lines()]
+        for node, attrs in self.nodes.items():
+            lines.append(f"\t{quote(node)}{format_attrs(attrs)}")
+        for source, target in self.edges:
+            lines.append(f"\t{quote(source)} -> {quote(target)}")
+        lines.append("}")
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self) -> dict:
+        """Convert the graph to a JSON-serializable dict."""
+        return {
+            "attrs": self.attrs,
+            "node_defaults": self.node_defaults,
+            "edge_defaults": self.edge_defaults,
+            "nodes": self.nodes,
+            "edges": [[source, target] for source, target in self.edges],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Graph":
+        """Create a graph from a dict produced by `to_dict`."""
+        graph = cls(
+            attrs=dict(data.get("attrs", {})),
+            node_defaults=dict(data.get("node_defaults", {})),
+            edge_defaults=dict(data.get("edge_defaults", {})),
+        )
+        for node, attrs in data.get("nodes", {}).items():
+            graph.add_node(node, attrs)
+        for source, target in data.get("edges", []):
+            graph.add_edge(source, target)
+        return graph
+
+
+def format_attrs(attrs: dict[str, str]) -> str:
+    """Format an attribute dict as a DOT attribute list."""
+    if not attrs:
+        return ""
+    body = ", ".join(f"{key} = {quote(value)}" for key, value in attrs.items())
+    return f" [{body}]"
+
+
+def parse_attrs(attr_list: str) -> dict[str, str]:
+    """Parse the inside of a DOT attribute list."""
+    attrs = {}
+    for attr in _ATTR_PATTERN.finditer(attr_list):
+        key, quoted, bare = attr.groups()
+        attrs[key] = unescape(quoted) if quoted is not None else bare
+    return attrs
+
+
+def parse_dot(dot_content: str) -> Graph:
+    """Parse DOT text as produced by `terraform graph`.
+
+    Graph attributes and defaults are only read at the top level; those of
+    subgraphs (e.g. module clusters) are dropped.
+    """
+    graph = Graph()
+    depth = 0
+
+    for line in dot_content.splitlines():
+        stripped = line.strip()
+        if stripped.startswith("}"):
+            depth -= 1
+        elif stripped.endswith("{"):
+            depth += 1
+            continue
+
+        edge_match = _EDGE_PATTERN.match(line)
+        if edge_match:
+            graph.add_edge(
+                unescape(edge_match.group(1)), unescape(edge_match.group(2))
+            )
+            continue
+
+        node_match = _NODE_PATTERN.match(line)
+        if node_match:
+            graph.add_node(
+                unescape(node_match.group(1)), parse_attrs(node_match.group(2))
+            )
+            continue
+
+        if depth != 1:
+            continue
+
+        defaults_match = _DEFAULTS_PATTERN.match(line)
+        if defaults_match:
+            kind, attr_list = defaults_match.groups()
+            defaults = {
+                "graph": graph.attrs,
+                "node": graph.node_defaults,
+                "edge": graph.edge_defaults,
+            }[kind]
+            defaults.update(parse_attrs(attr_list))
+            continue
+
+        attr_match = _GRAPH_ATTR_PATTERN.match(line)
+        if attr_match:
+            key, quoted, bare = attr_match.groups()
+            graph.attrs[key] = unescape(quoted) if quoted is not None else bare
+
+    return graph
+
+
+def graph_format(path: Path) -> str:
+    """Detect the format of a graph file: "tfvg", "json" or "dot"."""
+    from .graph_store import is_graph_store
+
+    if is_graph_store(path):
+        return "tfvg"
+    if path.suffix == ".json":
+        return "json"
+    return "dot"
+
+
+def load_graph(path: Path) -> Graph:
+    """Load a graph from a DOT, JSON or binary graph store file."""
+    from .graph_store import load_graph_store
+
+    file_format = graph_format(path)
+    if file_format == "tfvg":
+        return load_graph_store(path)
+    if file_format == "json":
+        data = json.loads(path.read_text())
+        try:
+            return Graph.from_dict(data)
+        except (AttributeError, TypeError, ValueError) as e:
+            raise ValueError(f"Not a graph JSON file: {path} ({e})")
+    return parse_dot(path.read_text())
+
+
+def save_graph(graph: Graph, path: Path, compress: bool = False) -> None:
+    """Save a graph as DOT, JSON or a binary graph store, based on the suffix."""
+    from .graph_store import save_graph_store
+
+    if path.suffix == ".tfvg":
+        save_graph_store(graph, path, compress)
+    elif path.suffix == ".json":
+        path.write_text(json.dumps(graph.to_dict()))
+    elif path.suffix in (".dot", ".gv"):
+        path.write_text(graph.to_dot())
+    else:
+        raise ValueError(
+            f"Unsupported graph file suffix '{path.suffix}' (use .tfvg, .json, .dot or .gv)"
+        )
@@ -1,19 +1,27 @@
 """Terraform graph generation."""
 
-import subprocess
 from pathlib import Path
 
 from rich.console import Console
 
+from .graph import Graph, parse_dot
+from .process_runner import ProcessResult, ProcessRunner
+
 console = Console()
 
 
 class GraphGenerator:
     """Generates Terraform dependency graphs."""
 
-    def __init__(self, tf_path: str, verbose: bool = False):
+    def __init__(
+        self,
+        tf_path: str,
+        verbose: bool = False,
+        runner: ProcessRunner | None = None,
+    ):
         self.tf_path = tf_path
         self.verbose = verbose
+        self.runner = runner or ProcessRunner(verbose=verbose)
 
     def generate(self, output_file: Path, plan_file: Path | None = None) -> None:
         """Generate Terraform dependency graph in DOT format."""
@@ -21,41 +29,53 @@ class GraphGenerator:
             if self.verbose:
                 console.print("[cyan]>>>[/] Generating TF graph...")
 
-            with open(output_file, "w") as dot_file:
-                cmd = self._build_command(plan_file)
+            cmd = self._build_command(plan_file)
+            result = self.runner.run_sync(cmd, stdout_path=output_file)
+            self._check_result(result)
+
+    async def generate_graph(
+        self,
+        cwd: Path | None = None,
+        plan_file: Path | None = None,
+        name: str | None = None,
+    ) -> Graph:
+        """Generate a Terraform dependency graph in `cwd` and parse it.
+
+        `name` identifies the root module in error messages.
+        """
+        cmd = self._build_command(plan_file)
+        result = await self.runner.run(cmd, cwd=cwd)
+        self._check_result(result, name)
+        return parse_dot(result.stdout)
 
-                result = subprocess.run(
-                    cmd,
-                    stdout=dot_file,
-                    stderr=subprocess.PIPE,
-                    text=True,
-                    shell=True,
-                )
+    def _check_result(self, result: ProcessResult, name: str | None = None) -> None:
+        """Report a failed `terraform graph` run and raise."""
+        if result.returncode == 0:
+            return
 
-                if result.returncode != 0:
-                    error_msg = result.stderr.strip()
+        error_msg = result.stderr.strip()
+        location = f" for [white]{name}[/]" if name else ""
 
-                    # Check if terraform command not found
-                    if (
-                        "not recognized" in error_msg
-                        or "command not found" in error_msg
-                    ):
-                        console.print(
-                            f"[bold red][ ERROR ][/] Terraform executable not found: [white]{self.tf_path}[/]"
-                        )
-                        console.print(
-                            "[yellow][ HINT  ][/] Use [cyan]--tf-path[/] to specify the full path to terraform.exe"
-                        )
-                        console.print(
-                            "[yellow][ HINT  ][/] Example: [cyan]terraform-viz --tf-path C:\\\\tools\\\\terraform.exe[/]"
-                        )
-                        raise RuntimeError("Terraform executable not accessible")
-                    else:
-                        console.print(
-                            f"[bold red][ ERROR ][/] Failed to generate TF graph"
-                        )
-                        console.print(f"[dim]{error_msg}[/]")
-                        raise RuntimeError("Terraform graph generation failed")
+        # Check if terraform command not found
+        if "not recognized" in error_msg or "command not found" in error_msg:
+            console.print(
+                f"[bold red][ ERROR ][/] Terraform executable not found: [white]{self.tf_path}[/]"
+            )
+            console.print(
+                "[yellow][ HINT  ][/] Use [cyan]--tf-path[/] to specify the full path to terraform.exe"
+            )
+            console.print(
+                "[yellow][ HINT  ][/] Example: [cyan]terraform-viz --tf-path C:\\\\tools\\\\terraform.exe[/]"
+            )
+            raise RuntimeError("Terraform executable not accessible")
+        else:
+            console.print(
+                f"[bold red][ ERROR ][/] Failed to generate TF graph{location}"
+            )
+            console.print(f"[dim]{error_msg}[/]")
+            if name:
+                raise RuntimeError(f"Terraform graph generation failed in {name}")
+            raise RuntimeError("Terraform graph generation failed")
 
     def _build_command(self, plan_file: Path | None) -> str:
         """Build the terraform graph command."""
@@ -0,0 +1,378 @@
+"""Compact binary storage for graph snapshots.
+
+A `.tfvg` file is a 32-byte header followed by a body of little-endian u32
+arrays and a string blob:
+
+    string_offsets  [string_count + 1]   byte offsets of strings in the blob
+    node_names      [node_count]         string index of each node name
+    row_offsets     [node_count + 1]     CSR: edges of node i are
+    targets         [edge_count]         targets[row_offsets[i]:row_offsets[i + 1]]
+    edge_order      [edge_count]         CSR position of each edge in graph order
+    column_keys     [column_count]       string index of each attribute name
+    column_values   [column_count * node_count]
+                                         string index per node, or MISSING
+    graph_attrs     [graph_attr_count * 3]
+                                         scope, key and value string index of
+                                         each graph attribute or default
+    blob                                 NUL-separated UTF-8 strings
+
+Uncompressed files are memory-mapped and read without copying. The
+compressed variant zlib-compresses the body and is decompressed on open.
+Every offset and index is checked on open, so a corrupt file raises
+ValueError there instead of failing on a later lookup.
+"""
+
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from itertools import accumulate
+from pathlib import Path
+
+from .graph import Graph
+
+MAGIC = b"TFVG"
+FORMAT_VERSION = 3
+FLAG_COMPRESSED = 0x1
+
+# magic, version, flags, node/edge/string/column/graph attr counts, body size
+_HEADER = struct.Struct("<4sHHIIIIII")
+
+# Scopes of graph_attrs entries: graph attributes, node and edge defaults
+SCOPE_GRAPH = 0
+SCOPE_NODE = 1
+SCOPE_EDGE = 2
+
+# Marks a node without a value in an attribute column
+MISSING = 0xFFFFFFFF
+
+
+def is_graph_store(path: Path) -> bool:
+    """Check whether a file is a binary graph store."""
+    with open(path, "rb") as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def save_graph_store(graph: Graph, path: Path, compress: bool = False) -> None:
+    """Write a graph as a binary graph store."""
+    strings: dict[str, int] = {}
+
+    def intern(value: str) -> int:
+        if "\0" in value:
+            raise ValueError(f"Graph strings cannot contain NUL bytes: {value!r}")
+        return strings.setdefault(value, len(strings))
+
+    nodes = list(graph.nodes)
+    node_index = {node: i for i, node in enumerate(nodes)}
+    node_names = [intern(node) for node in nodes]
+
+    # CSR adjacency, keeping the original edge order within each source
+    adjacency: list[list[int]] = [[] for _ in nodes]
+    for source, target in graph.edges:
+        adjacency[node_index[source]].append(node_index[target])
+    row_offsets = [0]
+    targets = []
+    for successors in adjacency:
+        targets.extend(successors)
+        row_offsets.append(len(targets))
+
+    # Edge order affects the dot layout, so record where each edge went
+    cursors = row_offsets[:-1]
+    edge_order = []
+    for source, _ in graph.edges:
+        source_index = node_index[source]
+        edge_order.append(cursors[source_index])
+        cursors[source_index] += 1
+
+    keys = list(
+        dict.fromkeys(key for attrs in graph.nodes.values() for key in attrs)
+    )
+    column_keys = [intern(key) for key in keys]
+    column_values = []
+    for key in keys:
+        for node in nodes:
+            value = graph.nodes[node].get(key)
+            column_values.append(MISSING if value is None else intern(value))
+
+    graph_attrs = []
+    for scope, attrs in (
+        (SCOPE_GRAPH, graph.attrs),
+        (SCOPE_NODE, graph.node_defaults),
+        (SCOPE_EDGE, graph.edge_defaults),
+    ):
+        for key, value in attrs.items():
+            graph_attrs.extend((scope, intern(key), intern(value)))
+
+    blob = "".join(f"{value}\0" for value in strings).encode()
+    string_offsets = [0]
+    for value in strings:
+        string_offsets.append(string_offsets[-1] + len(value.encode()) + 1)
+
+    ints = array(
+        "I",
+        string_offsets
+        + node_names
+        + row_offsets
+        + targets
+        + edge_order
+        + column_keys
+        + column_values
+        + graph_attrs,
+    )
+    if sys.byteorder != "little":
+        ints.byteswap()
+    body = ints.tobytes() + blob
+
+    flags = 0
+    if compress:
+        flags |= FLAG_COMPRESSED
+        payload = zlib.compress(body)
+    else:
+        payload = body
+
+    header = _HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        flags,
+        len(nodes),
+        len(targets),
+        len(strings),
+        len(keys),
+        len(graph_attrs) // 3,
+        len(body),
+    )
+    path.write_bytes(header + payload)
+
+
+class GraphStore:
+    """Read access to a binary graph store.
+
+    Node names, adjacency and attributes are read straight from the mapped
+    file; only the strings and ranges that are asked for are decoded.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._mmap = None
+        self._views: list[memoryview] = []
+
+        try:
+            self._open(path)
+        except BaseException:
+            self.close()
+            raise
+
+    def _open(self, path: Path) -> None:
+        """Read the header and map the body sections."""
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size or header[:4] != MAGIC:
+                raise ValueError(f"Not a graph store: {path}")
+
+            (
+                _,
+                version,
+                flags,
+                self.node_count,
+                self.edge_count,
+                self.string_count,
+                self.column_count,
+                self.graph_attr_count,
+                body_size,
+            ) = _HEADER.unpack(header)
+            if version != FORMAT_VERSION:
+                raise ValueError(
+                    f"Unsupported graph store version {version} in {path}"
+                )
+
+            if flags & FLAG_COMPRESSED:
+                try:
+                    body = memoryview(zlib.decompress(f.read()))
+                except zlib.error as e:
+                    raise ValueError(f"Corrupt graph store {path}: {e}")
+            else:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                body = memoryview(self._mmap)[_HEADER.size :]
+        self._views.append(body)
+
+        if len(body) < body_size:
+            raise ValueError(f"Truncated graph store: {path}")
+
+        sizes = (
+            self.string_count + 1,
+            self.node_count,
+            self.node_count + 1,
+            self.edge_count,
+            self.edge_count,
+            self.column_count,
+            self.column_count * self.node_count,
+            self.graph_attr_count * 3,
+        )
+        int_count = sum(sizes)
+        if int_count * 4 > body_size:
+            raise ValueError(f"Corrupt graph store header: {path}")
+
+        ints = self._u32_view(body[: int_count * 4])
+        blob = body[int_count * 4 : body_size]
+        self._views.extend((ints, blob))
+
+        offset = 0
+        sections = []
+        for size in sizes:
+            sections.append(ints[offset : offset + size])
+            offset += size
+        self._views.extend(sections)
+        (
+            self._string_offsets,
+            self._node_names,
+            self._row_offsets,
+            self._targets,
+            self._edge_order,
+            self._column_keys,
+            self._column_values,
+            self._graph_attrs,
+        ) = sections
+        self._blob = blob
+        self._validate()
+
+    def _validate(self) -> None:
+        """Check that every index in the body is in range.
+
+        Runs once on open, so later lookups cannot fail on a corrupt file.
+        """
+
+        def corrupt(section: str) -> ValueError:
+            return ValueError(f"Corrupt graph store {section}: {self.path}")
+
+        # Each string must end with the only NUL between its offsets
+        parts = bytes(self._blob).split(b"\0")
+        if len(parts) != self.string_count + 1 or parts[-1]:
+            raise corrupt("string table")
+        ends = accumulate((len(part) + 1 for part in parts[:-1]), initial=0)
+        if list(ends) != self._string_offsets.tolist():
+            raise corrupt("string offsets")
+
+        rows = self._row_offsets.tolist()
+        if rows[0] != 0 or rows[-1] != self.edge_count or rows != sorted(rows):
+            raise corrupt("row offsets")
+
+        if self.node_count and max(self._node_names) >= self.string_count:
+            raise corrupt("node names")
+        if self.edge_count and max(self._targets) >= self.node_count:
+            raise corrupt("edge targets")
+        if self.edge_count and max(self._edge_order) >= self.edge_count:
+            raise corrupt("edge order")
+        if self.column_count and max(self._column_keys) >= self.string_count:
+            raise corrupt("attribute keys")
+        values = set(self._column_values)
+        values.discard(MISSING)
+        if values and max(values) >= self.string_count:
+            raise corrupt("attribute values")
+
+        graph_attrs = self._graph_attrs.tolist()
+        if any(scope > SCOPE_EDGE for scope in graph_attrs[::3]) or any(
+            index >= self.string_count
+            for index in graph_attrs[1::3] + graph_attrs[2::3]
+        ):
+            raise corrupt("graph attributes")
+
+    @staticmethod
+    def _u32_view(buffer: memoryview):
+        """View a little-endian buffer as u32s, copying only on big-endian hosts."""
+        if sys.byteorder == "little":
+            return buffer.cast("I")
+        ints = array("I")
+        ints.frombytes(buffer)
+        ints.byteswap()
+        return ints
+
+    def __enter__(self) -> "GraphStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Release the views and unmap the file."""
+        # Release derived views before the views they were sliced from
+        for view in reversed(self._views):
+            if isinstance(view, memoryview):
+                view.release()
+        self._views = []
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def string(self, index: int) -> str:
+        """Decode a single string from the string table."""
+        start = self._string_offsets[index]
+        end = self._string_offsets[index + 1] - 1
+        return bytes(self._blob[start:end]).decode()
+
+    def strings(self) -> list[str]:
+        """Decode the whole string table at once."""
+        if not self.string_count:
+            return []
+        return bytes(self._blob).decode().split("\0")[: self.string_count]
+
+    def node_name(self, node: int) -> str:
+        """Get the name of a node by index."""
+        return self.string(self._node_names[node])
+
+    def successors(self, node: int) -> list[int]:
+        """Get the indices of the nodes a node has edges to."""
+        start = self._row_offsets[node]
+        end = self._row_offsets[node + 1]
+        return self._targets[start:end].tolist()
+
+    def node_attrs(self, node: int) -> dict[str, str]:
+        """Get the attributes of a node by index."""
+        attrs = {}
+        for column in range(self.column_count):
+            value = self._column_values[column * self.node_count + node]
+            if value != MISSING:
+                attrs[self.string(self._column_keys[column])] = self.string(value)
+        return attrs
+
+    def to_graph(self) -> Graph:
+        """Materialize the whole store as a Graph."""
+        strings = self.strings()
+        names = [strings[i] for i in self._node_names.tolist()]
+
+        attrs: list[dict[str, str]] = [{} for _ in names]
+        values = self._column_values.tolist()
+        for column, key_index in enumerate(self._column_keys.tolist()):
+            key = strings[key_index]
+            start = column * self.node_count
+            column_values = values[start : start + self.node_count]
+            for node_attrs, value in zip(attrs, column_values):
+                if value != MISSING:
+                    node_attrs[key] = strings[value]
+
+        row_offsets = self._row_offsets.tolist()
+        targets = self._targets.tolist()
+        csr_edges = [
+            (source, names[target])
+            for node, source in enumerate(names)
+            for target in targets[row_offsets[node] : row_offsets[node + 1]]
+        ]
+        edges = [csr_edges[position] for position in self._edge_order.tolist()]
+        graph = Graph(nodes=dict(zip(names, attrs)), edges=edges)
+
+        scopes = {
+            SCOPE_GRAPH: graph.attrs,
+            SCOPE_NODE: graph.node_defaults,
+            SCOPE_EDGE: graph.edge_defaults,
+        }
+        graph_attrs = self._graph_attrs.tolist()
+        for i in range(0, len(graph_attrs), 3):
+            scope, key, value = graph_attrs[i : i + 3]
+            scopes[scope][strings[key]] = strings[value]
+        return graph
+
+
+def load_graph_store(path: Path) -> Graph:
+    """Load a binary graph store as a Graph."""
+    with GraphStore(path) as store:
+        return store.to_graph()
@@ -4,11 +4,14 @@ from pathlib import Path
 
 from rich.console import Console
 
+from .cluster_renderer import ClusteredImageRenderer
 from .terminal_renderer import TerminalRenderer
 from .config import TFVizConfig
+from .estate import EstateBuilder
 from .executables import ExecutableFinder
 from .file_manager import FileManager
 from .graph_generator import GraphGenerator
+from .process_runner import ProcessLimits, ProcessRunner
 from .renderer import ImageRenderer
 
 console = Console()
@@ -20,6 +23,15 @@ class TFVizOrchestrator:
     def __init__(self, config: TFVizConfig):
         self.config = config
         self.file_manager = FileManager(verbose=config.verbose)
+        self.runner = ProcessRunner(
+            ProcessLimits(
+                timeout=config.timeout,
+                memory_mb=config.memory_limit_mb,
+                cpu_seconds=config.cpu_limit_seconds,
+            ),
+            max_concurrency=config.jobs,
+            verbose=config.verbose,
+        )
 
     def execute(self) -> Path:
         """Execute the full visualization pipeline."""
@@ -45,18 +57,12 @@ class TFVizOrchestrator:
             if self.config.output_path:
                 self.file_manager.ensure_output_dir(self.config.output_path)
 
-            # Generate graph (in current Terraform directory)
             temp_dot_file = Path("tf_graph.dot")
-            graph_gen = GraphGenerator(self.config.tf_path, self.config.verbose)
-            graph_gen.generate(temp_dot_file, self.config.plan_file)
-            
-            # Move DOT file to output directory if keeping it
-            if self.config.keep_dot and self.config.output_path:
-                import shutil
-                shutil.move(str(temp_dot_file), str(self.config.dot_file_path))
-                dot_file_to_use = self.config.dot_file_path
+            if self.config.graph_file:
+                # Visualize an existing graph file instead of running Terraform
+                dot_file_to_use = self.config.graph_file
             else:
-                dot_file_to_use = temp_dot_file
+                dot_file_to_use = self._generate_graph(temp_dot_file)
 
             # Render to appropriate format
             if self.config.terminal_output:
@@ -66,9 +72,22 @@ class TFVizOrchestrator:
                     dot_file_to_use,
                     None,  # Don't save to file, just print
                 )
+            elif self.config.cluster_modules:
+                # Render PNG image with per-module cluster layouts
+                renderer = ClusteredImageRenderer(
+                    dot_path,
+                    self.config.verbose,
+                    self.config.layout_cache_dir,
+                    self.runner,
+                )
+                renderer.render(
+                    dot_file_to_use,
+                    self.config.output_path,
+                    self.config.node_padding,
+                )
             else:
                 # Render PNG image
-                renderer = ImageRenderer(dot_path, self.config.verbose)
+                renderer = ImageRenderer(dot_path, self.config.verbose, self.runner)
                 renderer.render(
                     dot_file_to_use,
                     self.config.output_path,
@@ -76,7 +95,11 @@ class TFVizOrchestrator:
                 )
 
             # Cleanup temporary DOT file if not keeping
-            if not self.config.keep_dot and temp_dot_file.exists():
+            if (
+                not self.config.graph_file
+                and not self.config.keep_dot
+                and temp_dot_file.exists()
+            ):
                 self.file_manager.cleanup(temp_dot_file)
 
             # Report success (only for PNG output)
@@ -92,6 +115,30 @@ class TFVizOrchestrator:
 
                 os.chdir(original_dir)
 
+    def _generate_graph(self, temp_dot_file: Path) -> Path:
+        """Generate the DOT graph and return the file to render."""
+        # Generate graph (in current Terraform directory)
+        if self.config.estate_dirs:
+            # Merge graphs of many root modules into one estate graph
+            estate = EstateBuilder(
+                self.config.tf_path, self.config.verbose, self.runner
+            )
+            graph = estate.build(self.config.estate_dirs)
+            temp_dot_file.write_text(graph.to_dot())
+        else:
+            graph_gen = GraphGenerator(
+                self.config.tf_path, self.config.verbose, self.runner
+            )
+            graph_gen.generate(temp_dot_file, self.config.plan_file)
+
+        # Move DOT file to output directory if keeping it
+        if self.config.keep_dot and self.config.output_path:
+            import shutil
+
+            shutil.move(str(temp_dot_file), str(self.config.dot_file_path))
+            return self.config.dot_file_path
+        return temp_dot_file
+
     def _report_success(self) -> None:
         """Report successful generation."""
         console.print(
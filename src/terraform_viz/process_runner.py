@@ -0,0 +1,282 @@
+"""Async execution of external tools (Terraform, Graphviz) with limits."""
+
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from dataclasses import dataclass
+from pathlib import Path
+
+from rich.console import Console
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+console = Console()
+
+
+class ProcessTimeoutError(RuntimeError):
+    """Raised when a child process exceeds its timeout."""
+
+
+@dataclass
+class ProcessLimits:
+    """Limits applied to every child process."""
+
+    timeout: float | None = None
+    memory_mb: int | None = None
+    cpu_seconds: int | None = None
+
+    @property
+    def has_rlimits(self) -> bool:
+        """Whether any memory or CPU limit is set."""
+        return self.memory_mb is not None or self.cpu_seconds is not None
+
+    @staticmethod
+    def rlimits_supported() -> bool:
+        """Whether rlimits can be applied to a running child (Linux only)."""
+        return resource is not None and hasattr(resource, "prlimit")
+
+    def apply(self, pid: int) -> None:
+        """Set rlimits on a freshly started child."""
+        try:
+            if self.memory_mb is not None:
+                limit = self.memory_mb * 1024 * 1024
+                resource.prlimit(pid, resource.RLIMIT_AS, (limit, limit))
+            if self.cpu_seconds is not None:
+                resource.prlimit(
+                    pid, resource.RLIMIT_CPU, (self.cpu_seconds, self.cpu_seconds)
+                )
+        except ProcessLookupError:
+            # The child already exited
+            pass
+
+
+@dataclass
+class ProcessResult:
+    """Outcome of a finished child process."""
+
+    args: list[str] | str
+    returncode: int
+    stdout: str
+    stderr: str
+    duration: float
+    rusage: "resource.struct_rusage | None" = None
+
+    @property
+    def max_rss_mb(self) -> float | None:
+        """Peak resident memory of the child in megabytes."""
+        if self.rusage is None:
+            return None
+        # ru_maxrss is kilobytes on Linux but bytes on macOS
+        scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+        return self.rusage.ru_maxrss / scale
+
+    @property
+    def cpu_seconds(self) -> float | None:
+        """User plus system CPU time of the child."""
+        if self.rusage is None:
+            return None
+        return self.rusage.ru_utime + self.rusage.ru_stime
+
+
+class ProcessRunner:
+    """Runs child processes asynchronously with timeouts and resource limits.
+
+    A timeout or cancellation (including Ctrl-C) kills everything the child
+    spawned: its process group on POSIX, its process tree on Windows. Memory
+    and CPU limits are applied with `prlimit` right after the child starts, so
+    no code runs between fork and exec. Output is spooled to temporary files
+    and the child is reaped with `wait4` so its resource usage can be reported.
+    At most `max_concurrency` children run at once.
+    """
+
+    def __init__(
+        self,
+        limits: ProcessLimits | None = None,
+        max_concurrency: int | None = None,
+        verbose: bool = False,
+    ):
+        self.limits = limits or ProcessLimits()
+        self.max_concurrency = max_concurrency or os.cpu_count() or 1
+        self.verbose = verbose
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency)
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # Serializes reaping against killing, so a reaped pid is never signalled
+        self._reap_lock = threading.Lock()
+
+        if self.limits.has_rlimits and not self.limits.rlimits_supported():
+            console.print(
+                "[yellow][ WARN  ][/] Memory and CPU limits are only supported on Linux; ignoring them"
+            )
+
+    async def run(
+        self,
+        args: list[str] | str,
+        input: str | None = None,
+        stdout_path: Path | None = None,
+        cwd: Path | None = None,
+    ) -> ProcessResult:
+        """Run a command and return its result.
+
+        A string command runs through the shell. When `stdout_path` is given,
+        standard output is written there instead of being captured.
+        """
+        async with self._get_semaphore():
+            return await self._run(args, input, stdout_path, cwd)
+
+    def run_sync(
+        self,
+        args: list[str] | str,
+        input: str | None = None,
+        stdout_path: Path | None = None,
+        cwd: Path | None = None,
+    ) -> ProcessResult:
+        """Run a single command from synchronous code."""
+        return asyncio.run(self.run(args, input, stdout_path, cwd))
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Get the concurrency semaphore bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    async def _run(
+        self,
+        args: list[str] | str,
+        input: str | None,
+        stdout_path: Path | None,
+        cwd: Path | None,
+    ) -> ProcessResult:
+        """Start the child, wait for it and collect its output."""
+        with ExitStack() as stack:
+            stdin_file = stack.enter_context(tempfile.TemporaryFile())
+            stderr_file = stack.enter_context(tempfile.TemporaryFile())
+            stdout_file = stack.enter_context(
+                open(stdout_path, "wb") if stdout_path else tempfile.TemporaryFile()
+            )
+            if input is not None:
+                stdin_file.write(input.encode())
+                stdin_file.seek(0)
+
+            start = time.monotonic()
+            process = subprocess.Popen(
+                args,
+                stdin=stdin_file if input is not None else subprocess.DEVNULL,
+                stdout=stdout_file,
+                stderr=stderr_file,
+                shell=isinstance(args, str),
+                cwd=cwd,
+                **self._spawn_options(),
+            )
+            if self.limits.has_rlimits and self.limits.rlimits_supported():
+                self.limits.apply(process.pid)
+
+            loop = asyncio.get_running_loop()
+            waiter = loop.run_in_executor(self._executor, self._wait, process)
+            try:
+                returncode, rusage = await asyncio.wait_for(
+                    asyncio.shield(waiter), self.limits.timeout
+                )
+            except asyncio.TimeoutError:
+                self._kill(process)
+                await waiter
+                raise ProcessTimeoutError(
+                    f"Command timed out after {self.limits.timeout}s: "
+                    f"{self._describe(args)}"
+                )
+            except asyncio.CancelledError:
+                self._kill(process)
+                await asyncio.shield(waiter)
+                raise
+            duration = time.monotonic() - start
+
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode(errors="replace")
+            stdout = ""
+            if stdout_path is None:
+                stdout_file.seek(0)
+                stdout = stdout_file.read().decode(errors="replace")
+
+        result = ProcessResult(args, returncode, stdout, stderr, duration, rusage)
+        if self.verbose:
+            self._report(result)
+        return result
+
+    @staticmethod
+    def _spawn_options() -> dict:
+        """Get Popen options that give POSIX children their own process group."""
+        # Windows children stay in the console's group so they still get Ctrl-C
+        if os.name == "nt":
+            return {}
+        return {"start_new_session": True}
+
+    def _wait(
+        self, process: subprocess.Popen
+    ) -> tuple[int, "resource.struct_rusage | None"]:
+        """Block until the child exits, returning its exit code and rusage."""
+        if not hasattr(os, "wait4"):
+            return process.wait(), None
+
+        if not hasattr(os, "waitid"):
+            # macOS: poll under the lock, so a reaped pid is never signalled
+            while True:
+                with self._reap_lock:
+                    pid, status, rusage = os.wait4(process.pid, os.WNOHANG)
+                    if pid:
+                        process.returncode = os.waitstatus_to_exitcode(status)
+                        return process.returncode, rusage
+                time.sleep(0.01)
+
+        # Wait without reaping first: until the child is reaped its pid, and so
+        # its process group ID, cannot be reused by an unrelated process
+        os.waitid(os.P_PID, process.pid, os.WEXITED | os.WNOWAIT)
+        with self._reap_lock:
+            _, status, rusage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+        return process.returncode, rusage
+
+    def _kill(self, process: subprocess.Popen) -> None:
+        """Kill the child and everything it spawned."""
+        if os.name == "nt":
+            # The open process handle keeps the pid from being reused
+            if process.poll() is None:
+                subprocess.run(
+                    ["taskkill", "/F", "/T", "/PID", str(process.pid)],
+                    capture_output=True,
+                )
+            return
+
+        with self._reap_lock:
+            if process.returncode is not None:
+                return
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+    @staticmethod
+    def _describe(args: list[str] | str) -> str:
+        """Get a short description of a command for messages."""
+        return args if isinstance(args, str) else " ".join(args)
+
+    def _report(self, result: ProcessResult) -> None:
+        """Print duration and resource usage of a finished child."""
+        details = f"{result.duration:.2f}s"
+        if result.rusage is not None:
+            details += (
+                f", {result.cpu_seconds:.2f}s CPU, {result.max_rss_mb:.1f} MB peak"
+            )
+        name = Path(self._describe(result.args).split()[0]).name
+        console.print(f"[dim]>>>[/] {name} finished in [white]{details}[/]")
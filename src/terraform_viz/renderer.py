@@ -1,19 +1,27 @@
 """PNG rendering using Graphviz."""
 
-import subprocess
 from pathlib import Path
 
 from rich.console import Console
 
+from .graph import graph_format, load_graph
+from .process_runner import ProcessRunner
+
 console = Console()
 
 
 class ImageRenderer:
     """Renders DOT files to PNG images."""
 
-    def __init__(self, dot_path: str, verbose: bool = False):
+    def __init__(
+        self,
+        dot_path: str,
+        verbose: bool = False,
+        runner: ProcessRunner | None = None,
+    ):
         self.dot_path = dot_path
         self.verbose = verbose
+        self.runner = runner or ProcessRunner(verbose=verbose)
 
     def render(
         self, dot_file: Path, output_file: Path, node_padding: float = 1.0
@@ -25,27 +33,32 @@ class ImageRenderer:
             if self.verbose:
                 console.print("[cyan]>>>[/] Rendering PNG visualization...")
 
-            try:
+            # Graphviz only reads DOT, so other graph formats go through stdin
+            if graph_format(dot_file) != "dot":
+                source = load_graph(dot_file).to_dot()
+                cmd = self._build_render_command(None, output_file, node_padding)
+            else:
+                source = None
                 cmd = self._build_render_command(dot_file, output_file, node_padding)
-                subprocess.run(cmd, check=True)
-            except subprocess.CalledProcessError as e:
-                raise RuntimeError(f"Failed to render PNG: {e}")
+            result = self.runner.run_sync(cmd, input=source)
+            if result.returncode != 0:
+                raise RuntimeError(f"Failed to render PNG: {result.stderr.strip()}")
 
     def _build_render_command(
-        self, dot_file: Path, output_file: Path, node_padding: float
+        self, dot_file: Path | None, output_file: Path, node_padding: float
     ) -> list[str]:
-        """Build the Graphviz rendering command."""
+        """Build the Graphviz rendering command (reads stdin without a file)."""
         node_sep = node_padding * 0.8
         rank_sep = node_padding * 1.2
 
-        return [
+        cmd = [
             self.dot_path,
             "-Tpng",
             f"-Gnodesep={node_sep}",
             f"-Granksep={rank_sep}",
             "-Gmargin=0",
             "-Gdpi=150",
-            str(dot_file),
-            "-o",
-            str(output_file),
         ]
+        if dot_file is not None:
+            cmd.append(str(dot_file))
+        return cmd + ["-o", str(output_file)]
@@ -4,10 +4,13 @@ import re
 from pathlib import Path
 
 from rich.console import Console
+from rich.markup import escape
 from rich.panel import Panel
 from rich.tree import Tree
 from rich.text import Text
 
+from .graph import graph_format, load_graph
+
 console = Console()
 
 
@@ -22,8 +25,11 @@ class TerminalRenderer:
         if self.verbose:
             console.print("[cyan]>>>[/] Rendering terminal diagram...")
 
-        dot_content = dot_file.read_text()
-        nodes, edges = self._parse_dot_file(dot_content)
+        if graph_format(dot_file) != "dot":
+            graph = load_graph(dot_file)
+            nodes, edges = list(graph.nodes), graph.edges
+        else:
+            nodes, edges = self._parse_dot_file(dot_file.read_text())
         self._render_rich_diagram(nodes, edges)
         return ""  # Rich output is printed directly
 
@@ -134,11 +140,13 @@ class TerminalRenderer:
 
         def simplify_name(name: str) -> str:
             """Simplify node name for display."""
+            name = name.removeprefix("[root] ")
             name = name.replace("module.", "", 1)
             name = name.replace(
                 'provider["registry.terraform.io/hashicorp/', ""
             ).rstrip('"]')
-            return name
+            # Escape estate namespaces like "[network] " so Rich shows them
+            return escape(name)
 
         def build_tree(node: str, visited: set, depth: int = 0) -> Tree:
             """Recursively build a Rich Tree from the graph."""
@@ -0,0 +1,237 @@
+"""Tests for merging root module graphs into an estate graph."""
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from terraform_viz.estate import (
+    EstateBuilder,
+    EstateRoot,
+    RemoteState,
+    _block_body,
+    find_remote_states,
+)
+from terraform_viz.graph import parse_dot
+
+NETWORK_DOT = """digraph {
+\t"[root] aws_vpc.main (expand)" [label = "aws_vpc.main", shape = "box"]
+\t"[root] output.vpc_id (expand)" [label = "output.vpc_id", shape = "note"]
+\t"[root] output.vpc_id (expand)" -> "[root] aws_vpc.main (expand)"
+}
+"""
+
+APP_DOT = """digraph {
+\t"[root] aws_instance.web (expand)" [label = "aws_instance.web", shape = "box"]
+\t"[root] data.terraform_remote_state.network (expand)" [label = "data.terraform_remote_state.network", shape = "box"]
+\t"[root] aws_instance.web (expand)" -> "[root] data.terraform_remote_state.network (expand)"
+}
+"""
+
+APP_TF = """
+data "terraform_remote_state" "network" {
+  backend = "s3"
+  config = {
+    bucket = "states"
+    key    = "prod/network/terraform.tfstate"
+  }
+}
+
+resource "aws_instance" "web" {
+  subnet_id = data.terraform_remote_state.network.outputs.subnet_id
+  vpc_id    = data.terraform_remote_state.network.outputs.vpc_id
+}
+"""
+
+
+def root(name: str, path: str = "/estate", **remote_states: dict) -> EstateRoot:
+    """Build a root with remote states given as name=settings."""
+    return EstateRoot(
+        name,
+        Path(path) / name,
+        {
+            state: RemoteState(state, settings)
+            for state, settings in remote_states.items()
+        },
+    )
+
+
+class FindRemoteStatesTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_settings_and_outputs(self):
+        (self.tmp / "main.tf").write_text(APP_TF)
+        remote_states = find_remote_states(self.tmp)
+
+        self.assertEqual(list(remote_states), ["network"])
+        network = remote_states["network"]
+        self.assertEqual(network.settings, {"key": "prod/network/terraform.tfstate"})
+        self.assertEqual(network.outputs, {"subnet_id", "vpc_id"})
+
+    def test_references_across_files(self):
+        (self.tmp / "data.tf").write_text(APP_TF.split("resource")[0])
+        (self.tmp / "web.tf").write_text("resource" + APP_TF.split("resource")[1])
+        remote_states = find_remote_states(self.tmp)
+        self.assertEqual(remote_states["network"].outputs, {"subnet_id", "vpc_id"})
+
+    def test_unknown_remote_state_reference(self):
+        (self.tmp / "main.tf").write_text(
+            "locals { x = data.terraform_remote_state.missing.outputs.x }"
+        )
+        self.assertEqual(find_remote_states(self.tmp), {})
+
+    def test_block_body_nested(self):
+        content = 'data "x" "y" { config = { key = "a" } } after { }'
+        start = content.index("{") + 1
+        self.assertEqual(_block_body(content, start), ' config = { key = "a" } ')
+
+    def test_block_body_unclosed(self):
+        content = 'data "x" "y" { config = { key = "a" }'
+        start = content.index("{") + 1
+        self.assertEqual(_block_body(content, start), ' config = { key = "a" }')
+
+
+class ResolveProducerTest(unittest.TestCase):
+    def setUp(self):
+        self.builder = EstateBuilder("terraform")
+        self.roots = [
+            root("network", path="/estate/prod"),
+            root("app", path="/estate/prod"),
+        ]
+        self.index = self.builder._root_index(self.roots)
+
+    def resolve(self, state_name: str, **settings: str) -> str | None:
+        consumer = EstateRoot("app", Path("/estate/prod/app"))
+        return self.builder._resolve_producer(
+            consumer, RemoteState(state_name, settings), self.index
+        )
+
+    def test_local_path(self):
+        producer = self.resolve("net", path="../network/terraform.tfstate")
+        self.assertEqual(producer, "network")
+
+    def test_backend_key(self):
+        producer = self.resolve("net", key="prod/network/terraform.tfstate")
+        self.assertEqual(producer, "network")
+
+    def test_backend_prefix(self):
+        self.assertEqual(self.resolve("net", prefix="network"), "network")
+
+    def test_workspace_name(self):
+        self.assertEqual(self.resolve("net", name="network"), "network")
+
+    def test_shared_name(self):
+        self.assertEqual(self.resolve("network"), "network")
+
+    def test_unknown(self):
+        self.assertIsNone(self.resolve("dns", key="dns/terraform.tfstate"))
+
+
+class RootIndexTest(unittest.TestCase):
+    def test_ambiguous_names_dropped(self):
+        builder = EstateBuilder("terraform")
+        roots = [
+            EstateRoot("eu/prod", Path("/estate/eu/prod")),
+            EstateRoot("us/prod", Path("/estate/us/prod")),
+        ]
+        with mock.patch("terraform_viz.estate.console") as console:
+            index = builder._root_index(roots)
+
+        self.assertIn("Ambiguous root name", console.print.call_args.args[0])
+        self.assertNotIn("name:prod", index)
+        self.assertEqual(index["name:eu/prod"], "eu/prod")
+        self.assertEqual(index["name:us/prod"], "us/prod")
+
+
+class MergeTest(unittest.TestCase):
+    def setUp(self):
+        self.builder = EstateBuilder("terraform")
+
+    def test_cross_root_edge(self):
+        network = root("network")
+        app = root("app", network={"key": "network/terraform.tfstate"})
+        app.remote_states["network"].outputs.add("vpc_id")
+
+        estate = self.builder.merge(
+            [network, app], [parse_dot(NETWORK_DOT), parse_dot(APP_DOT)]
+        )
+
+        self.assertIn("[network] aws_vpc.main (expand)", estate.nodes)
+        self.assertEqual(
+            estate.nodes["[app] aws_instance.web (expand)"]["label"],
+            "app: aws_instance.web",
+        )
+        self.assertIn(
+            (
+                "[app] data.terraform_remote_state.network (expand)",
+                "[network] output.vpc_id (expand)",
+            ),
+            estate.edges,
+        )
+        self.assertEqual(len(estate.edges), 3)
+
+    def test_graph_attributes_kept(self):
+        network = parse_dot('digraph {\n\trankdir = "RL"\n' + NETWORK_DOT[10:])
+        app = parse_dot('digraph {\n\trankdir = "LR"\n' + APP_DOT[10:])
+        app.node_defaults["shape"] = "rect"
+
+        estate = self.builder.merge([root("network"), root("app")], [network, app])
+
+        self.assertEqual(estate.attrs, {"rankdir": "RL"})
+        self.assertEqual(estate.node_defaults, {"shape": "rect"})
+
+    def test_synthesized_output_node(self):
+        network = root("network")
+        app = root("app", network={})
+        app.remote_states["network"].outputs.add("subnet_id")
+
+        estate = self.builder.merge(
+            [network, app], [parse_dot(NETWORK_DOT), parse_dot(APP_DOT)]
+        )
+
+        self.assertEqual(
+            estate.nodes["[network] output.subnet_id"],
+            {"label": "network: output.subnet_id", "shape": "note"},
+        )
+        self.assertIn(
+            (
+                "[app] data.terraform_remote_state.network (expand)",
+                "[network] output.subnet_id",
+            ),
+            estate.edges,
+        )
+
+    def test_all_outputs_when_none_referenced(self):
+        network = root("network")
+        app = root("app", network={})
+
+        estate = self.builder.merge(
+            [network, app], [parse_dot(NETWORK_DOT), parse_dot(APP_DOT)]
+        )
+
+        self.assertIn(
+            (
+                "[app] data.terraform_remote_state.network (expand)",
+                "[network] output.vpc_id (expand)",
+            ),
+            estate.edges,
+        )
+
+    def test_own_root_not_linked(self):
+        app = root("app", app={})
+        builder = EstateBuilder("terraform", verbose=True)
+        with mock.patch("terraform_viz.estate.console") as console:
+            estate = builder.merge([app], [parse_dot(APP_DOT)])
+
+        self.assertEqual(len(estate.edges), 1)
+        messages = [call.args[0] for call in console.print.call_args_list]
+        self.assertTrue(any("refers to its own root" in m for m in messages))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+"""Tests for parsing and serializing DOT graphs."""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from terraform_viz.graph import Graph, load_graph, parse_dot, save_graph
+
+# Layout of `terraform graph` output from Terraform 1.7 on
+MODERN_DOT = """digraph G {
+  rankdir = "RL";
+  node [shape = rect, fontname = "sans-serif"];
+  edge [color = gray]
+  "aws_instance.web" [label="aws_instance.web"];
+  subgraph "cluster_module.net" {
+    label = "module.net"
+    fontname = "sans-serif"
+    "module.net.aws_vpc.main" [label="aws_vpc.main"];
+  }
+  "aws_instance.web" -> "module.net.aws_vpc.main";
+}
+"""
+
+
+class ParseDotTest(unittest.TestCase):
+    def test_graph_attributes_and_defaults(self):
+        graph = parse_dot(MODERN_DOT)
+        self.assertEqual(graph.attrs, {"rankdir": "RL"})
+        self.assertEqual(
+            graph.node_defaults, {"shape": "rect", "fontname": "sans-serif"}
+        )
+        self.assertEqual(graph.edge_defaults, {"color": "gray"})
+        self.assertEqual(
+            graph.nodes["module.net.aws_vpc.main"], {"label": "aws_vpc.main"}
+        )
+        self.assertEqual(
+            graph.edges, [("aws_instance.web", "module.net.aws_vpc.main")]
+        )
+
+    def test_to_dot_round_trip(self):
+        graph = parse_dot(MODERN_DOT)
+        dot = graph.to_dot()
+        self.assertIn('\trankdir = "RL"', dot)
+        self.assertIn('\tnode [shape = "rect", fontname = "sans-serif"]', dot)
+        self.assertEqual(parse_dot(dot), graph)
+
+    def test_json_round_trip(self):
+        graph = parse_dot(MODERN_DOT)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "graph.json"
+            save_graph(graph, path)
+            self.assertEqual(json.loads(path.read_text())["attrs"], graph.attrs)
+            self.assertEqual(load_graph(path), graph)
+
+    def test_json_without_attributes(self):
+        graph = Graph.from_dict({"nodes": {"a": {}}, "edges": []})
+        self.assertEqual(graph.attrs, {})
+        self.assertEqual(graph.to_dot(), 'digraph {\n\t"a"\n}\n')
+
+
+if __name__ == "__main__":
+    unittest.main()
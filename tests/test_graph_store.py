@@ -0,0 +1,217 @@
+"""Round-trip tests for the binary graph store."""
+
+import struct
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from terraform_viz import graph_store
+from terraform_viz.graph import Graph, load_graph, parse_dot, save_graph
+from terraform_viz.graph_store import _HEADER, GraphStore, save_graph_store
+
+EXAMPLE_DOT = Path(__file__).parent.parent / "examples" / "sample_graph.dot"
+
+
+def sample_graph() -> Graph:
+    """Build a graph covering escapes, unicode, implicit nodes and sparse attributes."""
+    graph = parse_dot(EXAMPLE_DOT.read_text())
+    graph.add_node('[root] module.ünï["a"].aws_x.y', {"label": "ü", "color": "red"})
+    graph.add_edge('[root] module.ünï["a"].aws_x.y', "[root] implicit")
+    graph.attrs["rankdir"] = "RL"
+    graph.node_defaults.update(shape="rect", fontname="sans-serif")
+    graph.edge_defaults["color"] = "gray"
+    return graph
+
+
+SECTIONS = (
+    "string_offsets",
+    "node_names",
+    "row_offsets",
+    "targets",
+    "edge_order",
+    "column_keys",
+    "column_values",
+    "graph_attrs",
+)
+
+
+def corrupt_u32(path: Path, section: str, index: int, value: int) -> None:
+    """Overwrite one u32 in a section of an uncompressed graph store."""
+    data = bytearray(path.read_bytes())
+    _, _, _, nodes, edges, strings, columns, attrs, _ = _HEADER.unpack_from(data)
+    sizes = (
+        strings + 1,
+        nodes,
+        nodes + 1,
+        edges,
+        edges,
+        columns,
+        columns * nodes,
+        attrs * 3,
+    )
+    start = sum(sizes[: SECTIONS.index(section)])
+    if index < 0:
+        index += sizes[SECTIONS.index(section)]
+    struct.pack_into("<I", data, _HEADER.size + 4 * (start + index), value)
+    path.write_bytes(bytes(data))
+
+
+class GraphStoreRoundTripTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def round_trip(self, graph: Graph, compress: bool) -> Graph:
+        path = self.tmp / "graph.tfvg"
+        save_graph(graph, path, compress)
+        return load_graph(path)
+
+    def test_uncompressed(self):
+        graph = sample_graph()
+        self.assertEqual(self.round_trip(graph, compress=False), graph)
+
+    def test_compressed(self):
+        graph = sample_graph()
+        self.assertEqual(self.round_trip(graph, compress=True), graph)
+
+    def test_interleaved_edge_order(self):
+        graph = Graph()
+        for source, target in [("a", "b"), ("c", "d"), ("a", "e"), ("c", "a")]:
+            graph.add_edge(source, target)
+        for compress in (False, True):
+            self.assertEqual(self.round_trip(graph, compress).edges, graph.edges)
+
+    def test_graph_attributes(self):
+        graph = self.round_trip(sample_graph(), compress=False)
+        self.assertEqual(
+            graph.attrs, {"compound": "true", "newrank": "true", "rankdir": "RL"}
+        )
+        self.assertEqual(
+            graph.node_defaults, {"shape": "rect", "fontname": "sans-serif"}
+        )
+        self.assertEqual(graph.edge_defaults, {"color": "gray"})
+
+    def test_empty_graph(self):
+        for compress in (False, True):
+            self.assertEqual(self.round_trip(Graph(), compress), Graph())
+
+    def test_big_endian_host(self):
+        graph = sample_graph()
+        with mock.patch.object(graph_store.sys, "byteorder", "big"):
+            self.assertEqual(self.round_trip(graph, compress=False), graph)
+
+    def test_random_access(self):
+        graph = sample_graph()
+        path = self.tmp / "graph.tfvg"
+        save_graph_store(graph, path)
+
+        nodes = list(graph.nodes)
+        source = nodes.index("[root] aws_instance.web")
+        with GraphStore(path) as store:
+            self.assertEqual(store.node_count, len(graph.nodes))
+            self.assertEqual(store.edge_count, len(graph.edges))
+            self.assertEqual(store.node_name(source), "[root] aws_instance.web")
+            self.assertEqual(store.node_attrs(source), graph.nodes[nodes[source]])
+            self.assertEqual(
+                [nodes[target] for target in store.successors(source)],
+                [t for s, t in graph.edges if s == nodes[source]],
+            )
+
+    def test_bad_magic(self):
+        path = self.tmp / "graph.tfvg"
+        path.write_bytes(b"digraph {}")
+        with self.assertRaisesRegex(ValueError, "Not a graph store"):
+            GraphStore(path)
+
+    def test_unsupported_version(self):
+        path = self.tmp / "graph.tfvg"
+        save_graph_store(sample_graph(), path)
+        data = bytearray(path.read_bytes())
+        data[4:6] = struct.pack("<H", 99)
+        path.write_bytes(bytes(data))
+        with self.assertRaisesRegex(ValueError, "Unsupported graph store version"):
+            GraphStore(path)
+
+    def test_truncated_body(self):
+        for compress in (False, True):
+            path = self.tmp / "graph.tfvg"
+            save_graph_store(sample_graph(), path, compress)
+            path.write_bytes(path.read_bytes()[:-20])
+            with self.assertRaises(ValueError):
+                GraphStore(path)
+
+    def test_header_counts_exceed_body(self):
+        path = self.tmp / "graph.tfvg"
+        save_graph_store(sample_graph(), path)
+        data = bytearray(path.read_bytes())
+        # Claim far more nodes than the body holds
+        data[8:12] = struct.pack("<I", 1_000_000)
+        path.write_bytes(bytes(data))
+        with self.assertRaisesRegex(ValueError, "Corrupt graph store header"):
+            GraphStore(path)
+
+    def assert_corrupt(self, section: str, index: int, value: int, message: str):
+        path = self.tmp / "graph.tfvg"
+        save_graph_store(sample_graph(), path)
+        corrupt_u32(path, section, index, value)
+        with self.assertRaisesRegex(ValueError, f"Corrupt graph store {message}"):
+            load_graph(path)
+
+    def test_node_name_out_of_range(self):
+        self.assert_corrupt("node_names", 0, 999999, "node names")
+
+    def test_edge_target_out_of_range(self):
+        self.assert_corrupt("targets", 0, 999999, "edge targets")
+
+    def test_edge_order_out_of_range(self):
+        self.assert_corrupt("edge_order", 0, 999999, "edge order")
+
+    def test_attribute_key_out_of_range(self):
+        self.assert_corrupt("column_keys", 0, 999999, "attribute keys")
+
+    def test_attribute_value_out_of_range(self):
+        self.assert_corrupt("column_values", 0, 999999, "attribute values")
+
+    def test_graph_attribute_scope_out_of_range(self):
+        self.assert_corrupt("graph_attrs", 0, 3, "graph attributes")
+
+    def test_graph_attribute_value_out_of_range(self):
+        self.assert_corrupt("graph_attrs", 2, 999999, "graph attributes")
+
+    def test_row_offsets_decreasing(self):
+        self.assert_corrupt("row_offsets", 1, 999999, "row offsets")
+
+    def test_row_offsets_end(self):
+        self.assert_corrupt("row_offsets", -1, 0, "row offsets")
+
+    def test_string_offsets_decreasing(self):
+        self.assert_corrupt("string_offsets", 1, 999999, "string offsets")
+
+    def test_string_offsets_end(self):
+        self.assert_corrupt("string_offsets", -1, 1, "string offsets")
+
+    def test_string_table_separators(self):
+        path = self.tmp / "graph.tfvg"
+        save_graph_store(sample_graph(), path)
+        data = path.read_bytes()
+        path.write_bytes(data[:-1] + b"x")
+        with self.assertRaisesRegex(ValueError, "Corrupt graph store string table"):
+            load_graph(path)
+
+    def test_json_not_a_graph(self):
+        path = self.tmp / "graph.json"
+        path.write_text("[1, 2]")
+        with self.assertRaisesRegex(ValueError, "Not a graph JSON file"):
+            load_graph(path)
+
+    def test_unsupported_suffix(self):
+        with self.assertRaisesRegex(ValueError, "Unsupported graph file suffix"):
+            save_graph(sample_graph(), self.tmp / "graph.png")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+"""Tests for the async process runner, using real child processes."""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import unittest
+from contextlib import contextmanager
+from pathlib import Path
+
+from terraform_viz.process_runner import (
+    ProcessLimits,
+    ProcessRunner,
+    ProcessTimeoutError,
+)
+
+
+@contextmanager
+def without_waitid():
+    """Hide os.waitid, as on macOS."""
+    waitid = os.waitid
+    del os.waitid
+    try:
+        yield
+    finally:
+        os.waitid = waitid
+
+
+def is_running(pid: int) -> bool:
+    """Check whether a process exists and is not a zombie."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    stat = Path(f"/proc/{pid}/stat")
+    try:
+        # The state follows the parenthesized command name
+        return stat.read_text().rsplit(")", 1)[1].split()[0] != "Z"
+    except (OSError, IndexError):
+        return True
+
+
+@unittest.skipIf(os.name == "nt", "uses POSIX shell commands")
+class ProcessRunnerTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_exit_code_and_output(self):
+        result = ProcessRunner().run_sync("echo out; echo err >&2; exit 3")
+        self.assertEqual(result.returncode, 3)
+        self.assertEqual(result.stdout, "out\n")
+        self.assertEqual(result.stderr, "err\n")
+        self.assertIsNotNone(result.rusage)
+
+    def test_input(self):
+        result = ProcessRunner().run_sync("tr a-z A-Z", input="digraph {}\n")
+        self.assertEqual(result.stdout, "DIGRAPH {}\n")
+
+    def test_stdout_path(self):
+        path = self.tmp / "out.dot"
+        result = ProcessRunner().run_sync("echo digraph", stdout_path=path)
+        self.assertEqual(result.stdout, "")
+        self.assertEqual(path.read_text(), "digraph\n")
+
+    def test_cwd(self):
+        result = ProcessRunner().run_sync("pwd", cwd=self.tmp)
+        self.assertEqual(Path(result.stdout.strip()).resolve(), self.tmp.resolve())
+
+    def test_timeout_kills_process_group(self):
+        pid_file = self.tmp / "pid"
+        runner = ProcessRunner(ProcessLimits(timeout=0.5))
+        start = time.monotonic()
+        with self.assertRaises(ProcessTimeoutError):
+            runner.run_sync(f'sleep 30 & echo $! > "{pid_file}"; sleep 30')
+        self.assertLess(time.monotonic() - start, 10)
+
+        # The backgrounded sleep is in the child's group and must be gone too
+        background = int(pid_file.read_text())
+        deadline = time.monotonic() + 5
+        while is_running(background) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertFalse(is_running(background))
+
+    def test_max_concurrency(self):
+        runner = ProcessRunner(max_concurrency=2)
+        log = self.tmp / "log"
+        command = f'echo start >> "{log}"; sleep 0.2; echo end >> "{log}"'
+
+        async def run_all():
+            await asyncio.gather(*(runner.run(command) for _ in range(6)))
+
+        asyncio.run(run_all())
+        running = peak = 0
+        for line in log.read_text().split():
+            running += 1 if line == "start" else -1
+            peak = max(peak, running)
+        self.assertEqual(peak, 2)
+
+    @unittest.skipUnless(hasattr(os, "waitid"), "os.waitid is already missing")
+    def test_without_waitid(self):
+        with without_waitid():
+            result = ProcessRunner().run_sync([sys.executable, "-c", "print('hi')"])
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(result.stdout.strip(), "hi")
+        self.assertIsNotNone(result.rusage)
+
+    @unittest.skipUnless(hasattr(os, "waitid"), "os.waitid is already missing")
+    def test_timeout_without_waitid(self):
+        runner = ProcessRunner(ProcessLimits(timeout=0.2))
+        with without_waitid(), self.assertRaises(ProcessTimeoutError):
+            runner.run_sync("sleep 30")
+
+
+if __name__ == "__main__":
+    unittest.main()